@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import clear_script_prefix, get_script_prefix, set_script_prefix
+from django.utils import translation
+
+from wagtail.models import Page
+
+from wagtail_review.mail import (
+    get_request_email_sender, send_review_request_emails, send_review_request_emails_in_thread
+)
+from wagtail_review.models import Review
+
+
+class TestRequestEmailSender(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='password'
+        )
+        self.homepage = Page.objects.get(url_path='/home/').specific
+        self.review = Review.objects.create(page_revision=self.homepage.save_revision(), submitter=self.admin_user)
+        self.review.reviewers.create(user=self.admin_user)
+        self.review.reviewers.create(email='someone@example.com')
+
+    def test_default_sender(self):
+        self.assertIs(get_request_email_sender(), send_review_request_emails)
+
+    @override_settings(WAGTAILREVIEW_REQUEST_EMAIL_SENDER='wagtail_review.mail.send_review_request_emails_in_thread')
+    def test_custom_sender(self):
+        self.assertIs(get_request_email_sender(), send_review_request_emails_in_thread)
+
+    @override_settings(WAGTAILREVIEW_REQUEST_EMAIL_SENDER='wagtail_review.mail.does_not_exist')
+    def test_missing_sender(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_request_email_sender()
+
+    def test_send_review_request_emails(self):
+        send_review_request_emails(self.review.pk)
+        self.assertEqual([email.to for email in mail.outbox], [['someone@example.com']])
+
+    def test_send_review_request_emails_in_thread(self):
+        with mock.patch('wagtail_review.mail.threading.Thread') as thread_class:
+            with self.captureOnCommitCallbacks(execute=True):
+                send_review_request_emails_in_thread(self.review.pk)
+                # nothing is started until the transaction is committed
+                thread_class.assert_not_called()
+
+        thread_class.assert_called_once()
+        thread_class.return_value.start.assert_called_once_with()
+
+        # run the thread's target here, where the test transaction's data is visible
+        with mock.patch('wagtail_review.mail.connection') as connection:
+            thread_class.call_args.kwargs['target']()
+        connection.close.assert_called_once_with()
+        self.assertEqual([email.to for email in mail.outbox], [['someone@example.com']])
+
+    @override_settings(ROOT_URLCONF='tests.urls_i18n')
+    def test_send_review_request_emails_in_thread_keeps_language_and_script_prefix(self):
+        with mock.patch('wagtail_review.mail.threading.Thread') as thread_class:
+            with self.captureOnCommitCallbacks(execute=True):
+                set_script_prefix('/prefix/')
+                try:
+                    with translation.override('fr'):
+                        send_review_request_emails_in_thread(self.review.pk)
+                finally:
+                    clear_script_prefix()
+
+        # run the thread's target with the default language and no script prefix active, as a new thread would
+        with mock.patch('wagtail_review.mail.connection'):
+            thread_class.call_args.kwargs['target']()
+
+        reviewer = self.review.reviewers.get(email='someone@example.com')
+        self.assertIn(
+            'http://test.local/prefix/fr/review/respond/%d/%s/' % (reviewer.id, reviewer.response_token),
+            mail.outbox[0].body
+        )
+        self.assertEqual(get_script_prefix(), '/')
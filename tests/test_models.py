@@ -1,10 +1,17 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_script_prefix, set_script_prefix
+from django.utils import translation
 
 from wagtail.models import Page
 
-from wagtail_review.models import Review, Reviewer
+from wagtail_review.models import Annotation, Response, Review, Reviewer
+from tests.models import SimplePage
 
 
 class TestReviewerModel(TestCase):
@@ -21,6 +28,29 @@ class TestReviewerModel(TestCase):
         self.assertRegexpMatches(reviewer.response_token, r'^\w{16}$')
         self.assertRegexpMatches(reviewer.view_token, r'^\w{16}$')
 
+    def test_tokens_are_independent(self):
+        reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
+        self.assertRegex(reviewer.response_token, r'^[a-z0-9]{16}$')
+        self.assertRegex(reviewer.view_token, r'^[a-z0-9]{16}$')
+        self.assertNotEqual(reviewer.response_token, reviewer.view_token)
+
+    def test_bulk_create_for_review(self):
+        spongebob = User.objects.get(username='spongebob')
+        with self.assertNumQueries(1):
+            Reviewer.bulk_create_for_review(self.review, [{'email': 'bob@example.com'}, {'user': spongebob}])
+
+        reviewers = self.review.reviewers.order_by('pk')
+        self.assertEqual(
+            [reviewer.get_email_address() for reviewer in reviewers],
+            ['bob@example.com', 'spongebob@example.com']
+        )
+        tokens = set()
+        for reviewer in reviewers:
+            self.assertRegex(reviewer.response_token, r'^[a-z0-9]{16}$')
+            self.assertRegex(reviewer.view_token, r'^[a-z0-9]{16}$')
+            tokens.update([reviewer.response_token, reviewer.view_token])
+        self.assertEqual(len(tokens), 4)
+
     def test_validate_email_or_user_required(self):
         reviewer = Reviewer(review=self.review)
         with self.assertRaises(ValidationError):
@@ -43,6 +73,32 @@ class TestReviewerModel(TestCase):
             'http://test.local/review/respond/%d/%s/' % (reviewer.id, reviewer.response_token)
         )
 
+    def test_get_respond_url_with_script_prefix(self):
+        reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
+        reviewer.get_respond_url()
+        set_script_prefix('/prefix/')
+        try:
+            self.assertEqual(
+                reviewer.get_respond_url(),
+                '/prefix/review/respond/%d/%s/' % (reviewer.id, reviewer.response_token)
+            )
+        finally:
+            clear_script_prefix()
+
+    @override_settings(ROOT_URLCONF='tests.urls_i18n')
+    def test_get_respond_url_with_language_prefix(self):
+        reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
+        with translation.override('en'):
+            self.assertEqual(
+                reviewer.get_respond_url(),
+                '/en/review/respond/%d/%s/' % (reviewer.id, reviewer.response_token)
+            )
+        with translation.override('fr'):
+            self.assertEqual(
+                reviewer.get_respond_url(),
+                '/fr/review/respond/%d/%s/' % (reviewer.id, reviewer.response_token)
+            )
+
     def test_get_view_url(self):
         reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
         self.assertEqual(
@@ -53,3 +109,158 @@ class TestReviewerModel(TestCase):
             reviewer.get_view_url(absolute=True),
             'http://test.local/review/view/%d/%s/' % (reviewer.id, reviewer.view_token)
         )
+
+
+class TestReviewModel(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='password'
+        )
+        self.homepage = Page.objects.get(url_path='/home/').specific
+        self.page = SimplePage(title="Simple page", slug="simple-page")
+        self.homepage.add_child(instance=self.page)
+
+    def test_get_pages_with_reviews_for_user(self):
+        self.assertFalse(Review.get_pages_with_reviews_for_user(self.admin_user).exists())
+
+        Review.objects.create(page_revision=self.homepage.save_revision(), submitter=self.admin_user)
+        latest_review = Review.objects.create(page_revision=self.page.save_revision(), submitter=self.admin_user)
+
+        pages = list(Review.get_pages_with_reviews_for_user(self.admin_user))
+        self.assertEqual([page.pk for page in pages], [self.page.pk, self.homepage.pk])
+        self.assertEqual(pages[0].last_review_requested_at, latest_review.created_at)
+
+    def test_get_pages_with_reviews_for_user_filters_on_base_content_type(self):
+        # object_id alone is not indexed on the revisions table; (base_content_type, object_id) is
+        Review.objects.create(page_revision=self.homepage.save_revision(), submitter=self.admin_user)
+        with CaptureQueriesContext(connection) as context:
+            list(Review.get_pages_with_reviews_for_user(self.admin_user))
+        page_query = context.captured_queries[-1]['sql']
+        self.assertIn('"base_content_type_id" = %d' % ContentType.objects.get_for_model(Page).pk, page_query)
+
+    def test_get_pages_with_reviews_for_user_sql_is_independent_of_reviewed_pages(self):
+        def get_sql():
+            with CaptureQueriesContext(connection) as context:
+                list(Review.get_pages_with_reviews_for_user(self.admin_user))
+            return [query['sql'] for query in context.captured_queries]
+
+        Review.objects.create(page_revision=self.homepage.save_revision(), submitter=self.admin_user)
+        sql_for_one_page = get_sql()
+        Review.objects.create(page_revision=self.page.save_revision(), submitter=self.admin_user)
+        self.assertEqual(get_sql(), sql_for_one_page)
+
+    def test_get_non_responding_reviewers(self):
+        review = Review.objects.create(page_revision=self.page.save_revision(), submitter=self.admin_user)
+        review.reviewers.create(user=self.admin_user)
+        responding_reviewer = review.reviewers.create(email='responding@example.com')
+        responding_reviewer.responses.create(result='comment', comment="First comment")
+        responding_reviewer.responses.create(result='approve', comment="Second comment")
+        waiting_reviewer = review.reviewers.create(email='waiting@example.com')
+
+        self.assertEqual(list(review.get_non_responding_reviewers()), [waiting_reviewer])
+
+    def test_send_request_emails_query_count_is_independent_of_reviewers(self):
+        def count_queries(reviewer_count):
+            review = Review.objects.create(page_revision=self.page.save_revision(), submitter=self.admin_user)
+            review.reviewers.create(user=self.admin_user)
+            for i in range(reviewer_count):
+                review.reviewers.create(email='reviewer%d@example.com' % i)
+            review = Review.objects.get(pk=review.pk)
+            with CaptureQueriesContext(connection) as context:
+                review.send_request_emails()
+            return len(context.captured_queries)
+
+        # warm up caches (e.g. content types) that are populated on first use
+        count_queries(1)
+        self.assertEqual(count_queries(1), count_queries(5))
+        self.assertEqual(len(mail.outbox), 7)
+
+
+class TestAnnotationModel(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.homepage = Page.objects.get(url_path='/home/').specific
+        self.review = Review.objects.create(page_revision=self.homepage.save_revision(), submitter=User.objects.first())
+        self.reviewer = Reviewer.objects.create(review=self.review, user=User.objects.get(username='spongebob'))
+        self.email_reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
+
+    def test_bulk_json_for_review(self):
+        annotation = self.reviewer.annotations.create(quote="Home", text="Needs a better title")
+        annotation.ranges.create(start='/h1[1]', start_offset=0, end='/h1[1]', end_offset=4)
+        annotation.ranges.create(start='/p[1]', start_offset=2, end='/p[2]', end_offset=0)
+        self.email_reviewer.annotations.create(quote="", text="Looks good")
+
+        self.assertEqual(
+            Annotation.bulk_json_for_review(self.review),
+            [annotation.as_json_data() for annotation in self.review.get_annotations().order_by('pk')]
+        )
+
+    def test_as_json_data_uses_prefetched_ranges(self):
+        for i in range(5):
+            annotation = self.reviewer.annotations.create(quote="Home", text="Comment %d" % i)
+            annotation.ranges.create(start='/p[2]', start_offset=0, end='/p[2]', end_offset=4)
+            annotation.ranges.create(start='/p[1]', start_offset=0, end='/p[1]', end_offset=4)
+
+        # one query for annotations, reviewers and users, and one for ranges
+        with self.assertNumQueries(2):
+            json_data = [annotation.as_json_data() for annotation in self.review.get_annotations()]
+        self.assertEqual(len(json_data), 5)
+        self.assertEqual([r['start'] for r in json_data[0]['ranges']], ['/p[2]', '/p[1]'])
+
+    def test_as_json_data(self):
+        annotation = self.reviewer.annotations.create(quote="Home", text="Needs a better title")
+        annotation.ranges.create(start='/h1[1]', start_offset=0, end='/h1[1]', end_offset=4)
+
+        annotation = Annotation.objects.select_related('reviewer__user').get(pk=annotation.pk)
+        with self.assertNumQueries(1):
+            json_data = annotation.as_json_data()
+        self.assertEqual(json_data, Annotation.bulk_json_for_review(self.review)[0])
+
+    def test_get_annotations_query_count(self):
+        for reviewer in (self.reviewer, self.email_reviewer):
+            for i in range(3):
+                annotation = reviewer.annotations.create(quote="Home", text="Comment %d" % i)
+                annotation.ranges.create(start='/h1[1]', start_offset=0, end='/h1[1]', end_offset=4)
+
+        # reviewers and their users are selected with the annotations; ranges are prefetched in one query
+        with self.assertNumQueries(2):
+            annotations = list(self.review.get_annotations())
+            names = [annotation.reviewer.get_name() for annotation in annotations]
+            ranges = [list(annotation.ranges.all()) for annotation in annotations]
+
+        self.assertEqual(sorted(set(names)), ['Spongebob Squarepants', 'bob@example.com'])
+        self.assertEqual([len(r) for r in ranges], [1] * 6)
+
+    def test_get_annotations_orders_ranges(self):
+        annotation = self.reviewer.annotations.create(quote="Home", text="Needs a better title")
+        first_range = annotation.ranges.create(start='/p[2]', start_offset=0, end='/p[2]', end_offset=4)
+        second_range = annotation.ranges.create(start='/p[1]', start_offset=0, end='/p[1]', end_offset=4)
+
+        [annotation] = self.review.get_annotations()
+        self.assertEqual(list(annotation.ranges.all()), [first_range, second_range])
+
+
+class TestResponseModel(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.submitter = User.objects.get(username='spongebob')
+        self.homepage = Page.objects.get(url_path='/home/').specific
+        self.review = Review.objects.create(page_revision=self.homepage.save_revision(), submitter=self.submitter)
+        self.reviewer = Reviewer.objects.create(review=self.review, email='bob@example.com')
+
+    def test_send_notifications_bulk(self):
+        self.reviewer.responses.create(result='comment', comment="Needs work")
+        self.reviewer.responses.create(result='approve', comment="")
+
+        Response.send_notifications_bulk(Response.objects.filter(reviewer__review=self.review))
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual([email.to for email in mail.outbox], [['spongebob@example.com'], ['spongebob@example.com']])
+        self.assertEqual(
+            sorted(email.subject for email in mail.outbox),
+            ["Response received from bob@example.com on: Home"] * 2
+        )
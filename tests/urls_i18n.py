@@ -0,0 +1,10 @@
+from django.conf.urls import include
+from django.conf.urls.i18n import i18n_patterns
+from django.urls import path
+
+from wagtail_review import urls as wagtailreview_urls
+
+
+urlpatterns = i18n_patterns(
+    path(r'review/', include(wagtailreview_urls)),
+)
@@ -0,0 +1,66 @@
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.urls import get_script_prefix, set_script_prefix
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+import swapper
+
+
+def send_review_request_emails(review_id, language=None, script_prefix=None):
+    """
+    Send request emails to the reviewers of the review with the given ID. This is the default
+    ``WAGTAILREVIEW_REQUEST_EMAIL_SENDER``, and is also the function to call from a task queue worker.
+
+    When called outside the request that submitted the review, pass that request's active language and
+    script prefix, so that the emails are translated and their links built as they would be in the request.
+    """
+    Review = swapper.load_model('wagtail_review', 'Review')
+    review = Review.objects.select_related('submitter', 'page_revision').get(pk=review_id)
+
+    previous_script_prefix = get_script_prefix()
+    if script_prefix is not None:
+        set_script_prefix(script_prefix)
+    try:
+        with translation.override(language or translation.get_language()):
+            review.send_request_emails()
+    finally:
+        set_script_prefix(previous_script_prefix)
+
+
+def send_review_request_emails_in_thread(review_id):
+    """
+    Send request emails from a background thread once the current transaction has been committed, so
+    that the request submitting the review does not wait on the mail server. Emails that have not been
+    sent when the process exits are lost, so a task queue is preferable where one is available.
+    """
+    # the thread does not share this thread's active language or script prefix, so pass them on
+    language = translation.get_language()
+    script_prefix = get_script_prefix()
+
+    def run():
+        try:
+            send_review_request_emails(review_id, language=language, script_prefix=script_prefix)
+        finally:
+            # the thread has its own database connection, which Django will not close for us
+            connection.close()
+
+    transaction.on_commit(lambda: threading.Thread(target=run, daemon=True).start())
+
+
+def get_request_email_sender():
+    """
+    Get the function for sending review request emails from the ``WAGTAILREVIEW_REQUEST_EMAIL_SENDER`` setting.
+    """
+    sender_name = getattr(
+        settings, 'WAGTAILREVIEW_REQUEST_EMAIL_SENDER', 'wagtail_review.mail.send_review_request_emails'
+    )
+    try:
+        return import_string(sender_name)
+    except ImportError:
+        raise ImproperlyConfigured(
+            "WAGTAILREVIEW_REQUEST_EMAIL_SENDER refers to a function '%s' that is not available" % sender_name
+        )
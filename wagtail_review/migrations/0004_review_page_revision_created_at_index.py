@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_review', '0003_response'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['page_revision', 'created_at'], name='wagtail_rev_page_re_99d814_idx'),
+        ),
+    ]
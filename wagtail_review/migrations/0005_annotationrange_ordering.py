@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_review', '0004_review_page_revision_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='annotationrange',
+            options={'ordering': ['pk']},
+        ),
+    ]
@@ -1,19 +1,25 @@
-import random
+import secrets
 import string
+from collections import defaultdict
+from functools import lru_cache
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.mail import get_connection
 from django.db import models
-from django.db.models import Case, Value, When
-from django.template.loader import render_to_string
-from django.urls import reverse
+from django.db.models import Exists, OuterRef, Subquery
+from django.db.models.functions import Cast
+from django.template.loader import get_template, render_to_string
+from django.urls import get_script_prefix, get_urlconf, reverse
 from django.utils.functional import cached_property
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 
 import swapper
 
 from wagtail import VERSION as WAGTAIL_VERSION
 from wagtail.admin.mail import send_mail
+from wagtail.models import Page
 
 if WAGTAIL_VERSION >= (5, 1):
     from wagtail.permission_policies.pages import PagePermissionPolicy
@@ -46,22 +52,32 @@ class BaseReview(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def send_request_emails(self):
-        # send request emails to all reviewers except the reviewer record for the user submitting the request
-        for reviewer in self.reviewers.exclude(user=self.submitter):
-            reviewer.send_request_email()
+        # send request emails to all reviewers except the reviewer record for the user submitting the request,
+        # over a single mail server connection
+        reviewers = self.reviewers.exclude(user=self.submitter).select_related('user')
+        templates = get_request_email_templates()
+        with get_connection() as connection:
+            # iterate in chunks rather than loading every reviewer (and user) into memory up front
+            for reviewer in reviewers.iterator(chunk_size=100):
+                # share this instance (and its cached submitter and revision_as_page) across all reviewers,
+                # rather than loading the review again for each one
+                reviewer.review = self
+                reviewer.send_request_email(connection=connection, templates=templates)
 
     @cached_property
     def revision_as_page(self):
         return self.page_revision.as_object()
 
     def get_annotations(self):
-        return Annotation.objects.filter(reviewer__review=self).prefetch_related('ranges')
+        return Annotation.objects.filter(reviewer__review=self).select_related('reviewer__user').prefetch_related('ranges')
 
     def get_responses(self):
-        return Response.objects.filter(reviewer__review=self).order_by('created_at').select_related('reviewer')
+        return Response.objects.filter(reviewer__review=self).order_by('created_at').select_related('reviewer__user')
 
     def get_non_responding_reviewers(self):
-        return self.reviewers.filter(responses__isnull=True).exclude(user=self.submitter)
+        return self.reviewers.filter(
+            ~Exists(Response.objects.filter(reviewer=OuterRef('pk')))
+        ).exclude(user=self.submitter)
 
     @classmethod
     def get_pages_with_reviews_for_user(cls, user):
@@ -74,34 +90,23 @@ class BaseReview(models.Model):
         else:
             editable_pages = UserPagePermissionsProxy(user).editable_pages()
 
-        # Get reviewed page IDs
-        reviewed_page_ids = cls.objects.values_list(revision_page_fk_relation, flat=True).distinct()
-
-        # Fetch the latest review creation date for each page
-        latest_reviews = (
-            cls.objects.filter(**{f"{revision_page_fk_relation}__in": reviewed_page_ids})
+        # Latest review creation date for each page, correlated against the outer page queryset.
+        # Revision.object_id is a string, so the page pk has to be cast to match it; filtering on the
+        # base content type as well lets the database use Wagtail's (base_content_type, object_id) index
+        latest_review_requested_at = (
+            cls.objects.filter(**{
+                revision_page_fk_relation: Cast(OuterRef("pk"), output_field=models.CharField()),
+                "page_revision__base_content_type": ContentType.objects.get_for_model(Page),
+            })
+            .order_by()
             .values(revision_page_fk_relation)
             .annotate(last_review_requested_at=models.Max("created_at"))
+            .values("last_review_requested_at")[:1]
         )
 
-        # Map page IDs to their latest review date
-        latest_reviews_map = {
-            review[revision_page_fk_relation]: review["last_review_requested_at"]
-            for review in latest_reviews
-        }
-
-        # Add `last_review_requested_at` annotation to editable pages
         pages_with_reviews = (
-            editable_pages.filter(pk__in=reviewed_page_ids)
-            .annotate(
-                last_review_requested_at=models.Case(
-                    *[
-                        models.When(pk=pk, then=models.Value(created_at))
-                        for pk, created_at in latest_reviews_map.items()
-                    ],
-                    output_field=models.DateTimeField(),
-                )
-            )
+            editable_pages.annotate(last_review_requested_at=Subquery(latest_review_requested_at))
+            .filter(last_review_requested_at__isnull=False)
             .order_by("-last_review_requested_at")
         )
 
@@ -109,15 +114,80 @@ class BaseReview(models.Model):
 
     class Meta:
         abstract = True
+        indexes = [
+            # lets the latest-review subquery in get_pages_with_reviews_for_user read created_at for each
+            # matching revision from the index; finding those revisions relies on Wagtail's
+            # (base_content_type, object_id) index on the revisions table
+            models.Index(fields=['page_revision', 'created_at']),
+        ]
 
 
 class Review(BaseReview):
-    class Meta:
+    class Meta(BaseReview.Meta):
         swappable = swapper.swappable_setting('wagtail_review', 'Review')
 
 
+TOKEN_ALPHABET = string.ascii_lowercase + string.digits
+TOKEN_LENGTH = 16
+# random bytes consumed per token: 160 bits, well over the ~83 bits a 16-character base-36 token holds,
+# so the bias introduced by reducing the number modulo 36 is negligible
+TOKEN_RANDOM_BYTES = 20
+
+
+def _token_from_bytes(data):
+    n = int.from_bytes(data, 'big')
+    chars = []
+    for _ in range(TOKEN_LENGTH):
+        n, i = divmod(n, len(TOKEN_ALPHABET))
+        chars.append(TOKEN_ALPHABET[i])
+    return ''.join(chars)
+
+
 def generate_token():
-    return ''.join(random.SystemRandom().choice(string.ascii_lowercase + string.digits) for _ in range(16))
+    return _token_from_bytes(secrets.token_bytes(TOKEN_RANDOM_BYTES))
+
+
+def generate_token_pair():
+    """
+    Return two independent tokens, as generated by generate_token, from a single draw of random bytes
+    """
+    data = secrets.token_bytes(TOKEN_RANDOM_BYTES * 2)
+    return _token_from_bytes(data[:TOKEN_RANDOM_BYTES]), _token_from_bytes(data[TOKEN_RANDOM_BYTES:])
+
+
+# Placeholder values substituted into reversed reviewer URLs, to be swapped for the real id and token
+_REVIEWER_URL_ID_PLACEHOLDER = 918273645546372819
+_REVIEWER_URL_TOKEN_PLACEHOLDER = 'wagtailreviewtokenplaceholder'
+
+
+@lru_cache(maxsize=None)
+def _get_reviewer_url_template(url_name, script_prefix, urlconf, language):
+    # script_prefix, urlconf and language (for URLs under i18n_patterns) are only part of the cache key;
+    # reverse() picks them up itself
+    url = reverse(url_name, args=[_REVIEWER_URL_ID_PLACEHOLDER, _REVIEWER_URL_TOKEN_PLACEHOLDER])
+    return url.replace('%', '%%').replace(
+        str(_REVIEWER_URL_ID_PLACEHOLDER), '%(id)s'
+    ).replace(
+        _REVIEWER_URL_TOKEN_PLACEHOLDER, '%(token)s'
+    )
+
+
+def _reverse_reviewer_url(url_name, reviewer_id, token):
+    """
+    Equivalent to reverse(url_name, args=[reviewer_id, token]), but only walks the URL resolver
+    once per URL name, which adds up when generating URLs for every reviewer on a review
+    """
+    template = _get_reviewer_url_template(
+        url_name, get_script_prefix(), get_urlconf() or settings.ROOT_URLCONF, get_language()
+    )
+    return template % {'id': reviewer_id, 'token': token}
+
+
+def get_request_email_templates():
+    return (
+        get_template('wagtail_review/email/request_review_subject.txt'),
+        get_template('wagtail_review/email/request_review.txt'),
+    )
 
 
 class Reviewer(models.Model):
@@ -144,26 +214,46 @@ class Reviewer(models.Model):
         return user_display_name(self.user) if self.user else self.email
 
     def save(self, **kwargs):
-        if not self.response_token:
-            self.response_token = generate_token()
-        if not self.view_token:
-            self.view_token = generate_token()
+        if not (self.response_token and self.view_token):
+            response_token, view_token = generate_token_pair()
+            self.response_token = self.response_token or response_token
+            self.view_token = self.view_token or view_token
 
         super().save(**kwargs)
 
+    @classmethod
+    def bulk_create_for_review(cls, review, reviewer_dicts, batch_size=500):
+        """
+        Create Reviewer records for the given review in as few queries as possible. reviewer_dicts is an
+        iterable of dicts of field values (user and/or email) for each reviewer. Tokens are generated here,
+        as bulk_create does not call save()
+        """
+        reviewers = []
+        for reviewer_dict in reviewer_dicts:
+            response_token, view_token = generate_token_pair()
+            reviewers.append(cls(review=review, response_token=response_token, view_token=view_token, **reviewer_dict))
+
+        return cls.objects.bulk_create(reviewers, batch_size=batch_size)
+
     def get_respond_url(self, absolute=False):
-        url = reverse('wagtail_review:respond', args=[self.id, self.response_token])
+        url = _reverse_reviewer_url('wagtail_review:respond', self.id, self.response_token)
         if absolute:
             url = settings.WAGTAILADMIN_BASE_URL + url
         return url
 
     def get_view_url(self, absolute=False):
-        url = reverse('wagtail_review:view', args=[self.id, self.view_token])
+        url = _reverse_reviewer_url('wagtail_review:view', self.id, self.view_token)
         if absolute:
             url = settings.WAGTAILADMIN_BASE_URL + url
         return url
 
-    def send_request_email(self):
+    def _build_request_email(self, templates=None):
+        """
+        Return a (subject, content, email_address) tuple for this reviewer's review request email.
+        templates is an optional (subject_template, content_template) pair as returned by
+        get_request_email_templates, to avoid looking the templates up again for each reviewer
+        """
+        subject_template, content_template = templates or get_request_email_templates()
         email_address = self.get_email_address()
 
         context = {
@@ -176,10 +266,14 @@ class Reviewer(models.Model):
             'view_url': self.get_view_url(absolute=True),
         }
 
-        email_subject = render_to_string('wagtail_review/email/request_review_subject.txt', context).strip()
-        email_content = render_to_string('wagtail_review/email/request_review.txt', context).strip()
+        email_subject = subject_template.render(context).strip()
+        email_content = content_template.render(context).strip()
+
+        return email_subject, email_content, email_address
 
-        send_mail(email_subject, email_content, [email_address])
+    def send_request_email(self, connection=None, templates=None):
+        email_subject, email_content, email_address = self._build_request_email(templates=templates)
+        send_mail(email_subject, email_content, [email_address], connection=connection)
 
 
 class Annotation(models.Model):
@@ -204,6 +298,46 @@ class Annotation(models.Model):
             'ranges': [r.as_json_data() for r in self.ranges.all()],
         }
 
+    @classmethod
+    def bulk_json_for_review(cls, review):
+        """
+        Return the as_json_data representation of all annotations on the given review, built from
+        flat values() queries rather than instantiating an Annotation and AnnotationRange per row
+        """
+        # reviewer names go through get_name() so that custom user models' get_full_name is respected;
+        # there is one query for this regardless of the number of annotations
+        reviewer_names = {
+            reviewer.id: reviewer.get_name()
+            for reviewer in review.reviewers.select_related('user')
+        }
+
+        ranges_by_annotation_id = defaultdict(list)
+        ranges = AnnotationRange.objects.filter(annotation__reviewer__review=review).order_by('pk').values(
+            'annotation_id', *AnnotationRange.JSON_DATA_FIELDS
+        )
+        for r in ranges:
+            ranges_by_annotation_id[r['annotation_id']].append(AnnotationRange.json_data_from_values(r))
+
+        annotations = cls.objects.filter(reviewer__review=review).order_by('pk').values(
+            'id', 'text', 'quote', 'created_at', 'updated_at', 'reviewer_id'
+        )
+        return [
+            {
+                'id': a['id'],
+                'annotator_schema_version': 'v1.0',
+                'created': a['created_at'].isoformat(),
+                'updated': a['updated_at'].isoformat(),
+                'text': a['text'],
+                'quote': a['quote'],
+                'user': {
+                    'id': a['reviewer_id'],
+                    'name': reviewer_names[a['reviewer_id']],
+                },
+                'ranges': ranges_by_annotation_id[a['id']],
+            }
+            for a in annotations
+        ]
+
 
 class AnnotationRange(models.Model):
     annotation = models.ForeignKey(Annotation, related_name='ranges', on_delete=models.CASCADE)
@@ -212,6 +346,9 @@ class AnnotationRange(models.Model):
     end = models.TextField()
     end_offset = models.IntegerField()
 
+    # fields to request from a values() query to be passed to json_data_from_values
+    JSON_DATA_FIELDS = ('start', 'start_offset', 'end', 'end_offset')
+
     def as_json_data(self):
         return {
             'start': self.start,
@@ -220,6 +357,23 @@ class AnnotationRange(models.Model):
             'endOffset': self.end_offset,
         }
 
+    @staticmethod
+    def json_data_from_values(values):
+        """
+        Return the as_json_data representation of a range from a dict of its field values, as returned
+        by a values() query, so that no AnnotationRange instance needs to be created
+        """
+        return {
+            'start': values['start'],
+            'startOffset': values['start_offset'],
+            'end': values['end'],
+            'endOffset': values['end_offset'],
+        }
+
+    class Meta:
+        # keep ranges in the order they were created, whether fetched directly or via prefetch_related
+        ordering = ['pk']
+
 
 RESULT_CHOICES = (
     ('approve', 'Approved'),
@@ -233,7 +387,7 @@ class Response(models.Model):
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def send_notification_to_submitter(self):
+    def send_notification_to_submitter(self, connection=None):
         submitter = self.reviewer.review.submitter
         if submitter.email:
 
@@ -248,4 +402,22 @@ class Response(models.Model):
             email_subject = render_to_string('wagtail_review/email/response_received_subject.txt', context).strip()
             email_content = render_to_string('wagtail_review/email/response_received.txt', context).strip()
 
-            send_mail(email_subject, email_content, [submitter.email])
+            send_mail(email_subject, email_content, [submitter.email], connection=connection)
+
+    @classmethod
+    def send_notifications_bulk(cls, responses):
+        """
+        Send the submitter notification for each response in the given queryset, over a single
+        mail server connection
+        """
+        responses = responses.select_related(
+            'reviewer__user', 'reviewer__review__submitter', 'reviewer__review__page_revision'
+        )
+
+        reviews_by_id = {}
+        with get_connection() as connection:
+            for response in responses:
+                # share one instance per review, so that revision_as_page is only evaluated once per review
+                review = response.reviewer.review
+                response.reviewer.review = reviews_by_id.setdefault(review.pk, review)
+                response.send_notification_to_submitter(connection=connection)
@@ -101,7 +101,8 @@ class DashboardView(generic.IndexView):
     context_object_name = 'pages'
 
     def get_queryset(self):
-        return Review.get_pages_with_reviews_for_user(self.request.user)
+        # only load the columns the dashboard listing displays
+        return Review.get_pages_with_reviews_for_user(self.request.user).only('id', 'title', 'draft_title')
 
 
 class AuditTrailView(DetailView):
@@ -129,7 +130,7 @@ class AuditTrailView(DetailView):
 
 
 def view_review_page(request, review_id=None):
-    review = get_object_or_404(Review, id=review_id)
+    review = get_object_or_404(Review.objects.select_related('page_revision'), id=review_id)
 
     # find a reviewer record corresponding to the current user
     # (the submitter of the review should always have one)
@@ -140,7 +141,7 @@ def view_review_page(request, review_id=None):
         # if they have edit access to the page, give them the submitter's
         # read-only credentials so that they can see annotations
 
-        page = review.page_revision.as_object()
+        page = review.revision_as_page
         perms = page.permissions_for_user(request.user)
 
         if not (perms.can_edit() or perms.can_publish()):
@@ -151,7 +152,7 @@ def view_review_page(request, review_id=None):
         except Reviewer.DoesNotExist:
             raise PermissionDenied
 
-    page = review.page_revision.as_object()
+    page = review.revision_as_page
     if reviewer.user == request.user:
         review_mode = 'comment'
     else:
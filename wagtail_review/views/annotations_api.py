@@ -39,10 +39,7 @@ def index(request):
     reviewer, mode = _check_reviewer_credentials(request)
 
     if request.method == 'GET':
-        results = [
-            annotation.as_json_data()
-            for annotation in reviewer.review.get_annotations()
-        ]
+        results = Annotation.bulk_json_for_review(reviewer.review)
         return JsonResponse(results, safe=False)
 
     elif request.method == 'POST':
@@ -98,10 +95,7 @@ def item(request, id):
 def search(request):
     reviewer, mode = _check_reviewer_credentials(request)
 
-    results = [
-        annotation.as_json_data()
-        for annotation in reviewer.review.get_annotations()
-    ]
+    results = Annotation.bulk_json_for_review(reviewer.review)
     return JsonResponse({
         'total': len(results),
         'rows': results
@@ -12,11 +12,11 @@ SUCCESS_RESPONSE_MESSAGE = "Thank you, your review has been received."
 
 
 def view(request, reviewer_id, token):
-    reviewer = get_object_or_404(Reviewer, id=reviewer_id)
+    reviewer = get_object_or_404(Reviewer.objects.select_related('review__page_revision'), id=reviewer_id)
     if token != reviewer.view_token:
         raise PermissionDenied
 
-    page = reviewer.review.page_revision.as_object()
+    page = reviewer.review.revision_as_page
     return page.make_preview_request(
         original_request=request,
         extra_request_attrs={
@@ -27,7 +27,10 @@ def view(request, reviewer_id, token):
 
 
 def respond(request, reviewer_id, token):
-    reviewer = get_object_or_404(Reviewer, id=reviewer_id)
+    # the review, revision and submitter are all needed to notify the submitter of a response
+    reviewer = get_object_or_404(
+        Reviewer.objects.select_related('review__page_revision', 'review__submitter'), id=reviewer_id
+    )
     if token != reviewer.response_token:
         raise PermissionDenied
 
@@ -43,7 +46,7 @@ def respond(request, reviewer_id, token):
             return HttpResponse(SUCCESS_RESPONSE_MESSAGE)
 
     else:
-        page = reviewer.review.page_revision.as_object()
+        page = reviewer.review.revision_as_page
         # Fetch the CSRF token so that Django will return a set-cookie header in the case that this is
         # the user's first request, and ensure that the dummy request (where the submit-review form is
         # rendered) is using the same token
@@ -13,6 +13,8 @@ from wagtail import hooks
 
 from wagtail_review import admin_urls
 from wagtail_review.forms import get_review_form_class, ReviewerFormSet
+from wagtail_review.mail import get_request_email_sender
+from wagtail_review.models import Reviewer
 
 Review = swapper.load_model('wagtail_review', 'Review')
 
@@ -61,12 +63,16 @@ def handle_submit_for_review(request, page):
             raise Exception("Reviewer formset failed validation")
 
         form.save()
-        reviewer_formset.save()
 
-        # create a reviewer record for the current user
-        review.reviewers.create(user=review.submitter)
+        # create the reviewer records from the formset, plus one for the current user, in bulk
+        reviewer_dicts = [
+            {'user': reviewer.user, 'email': reviewer.email}
+            for reviewer in reviewer_formset.save(commit=False)
+        ]
+        reviewer_dicts.append({'user': review.submitter})
+        Reviewer.bulk_create_for_review(review, reviewer_dicts)
 
-        review.send_request_emails()
+        get_request_email_sender()(review.pk)
 
         # clear original confirmation message as set by the create/edit view,
         # so that we can replace it with our own